@@ -7,7 +7,8 @@ This module provides:
 - Integration with OpenAI Agents SDK
 """
 
-from typing import Literal
+from dataclasses import dataclass
+from typing import Literal, get_args
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -19,8 +20,9 @@ load_dotenv()
 
 
 # --- LLM Configuration ---
-class LLMConfig(BaseModel):
-    """Configuration for a single LLM provider."""
+@dataclass(frozen=True, slots=True)
+class LLMConfig:
+    """Configuration for a single LLM provider (static registry entry)."""
 
     model_name: str
     base_url: str
@@ -28,7 +30,7 @@ class LLMConfig(BaseModel):
 
 
 # Static registry of available LLM providers.
-# Add new providers here without modifying other code.
+# Add new providers here and to LLMProvider below.
 AVAILABLE_LLMS: dict[str, LLMConfig] = {
     "openai": LLMConfig(
         model_name="gpt-4o-mini",
@@ -62,9 +64,14 @@ AVAILABLE_LLMS: dict[str, LLMConfig] = {
     ),
 }
 
-# Dynamic Literal type from registry keys for type safety
+# Literal type of the registry keys for type safety (static checkers and
+# settings validation). Checked against the registry at import so the two
+# cannot drift apart.
 LLMProvider = Literal["openai", "openai-gpt4", "gemini", "deepseek", "groq", "groq-fast"]
 
+if set(get_args(LLMProvider)) != AVAILABLE_LLMS.keys():
+    raise RuntimeError("LLMProvider and AVAILABLE_LLMS keys are out of sync")
+
 
 # --- Application Settings ---
 class MCPSettings(BaseModel):
@@ -81,6 +88,11 @@ class MCPSettings(BaseModel):
     retry_delay: float = Field(
         default=1.0, description="Delay between retries in seconds"
     )
+    append_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Timeout in seconds for append_expense's sheet read and write",
+    )
 
 
 class OrchestratorSettings(BaseModel):
@@ -98,14 +110,41 @@ class OrchestratorSettings(BaseModel):
     validator_provider: LLMProvider = Field(
         default="gemini", description="LLM provider for validation (Gemini)"
     )
+    deadline_seconds: float = Field(
+        default=120.0,
+        gt=0,
+        description="Wall-clock budget for processing one receipt, in seconds",
+    )
+    merchant_cache_min_observations: int = Field(
+        default=3,
+        description=(
+            "Validator approvals needed for a merchant before its validation "
+            "is answered from the merchant cache (0 disables the cache)"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Receipts processed concurrently by the batch endpoint",
+    )
+    tracing_enabled: bool = Field(
+        default=True,
+        description="Record an OpenAI Agents SDK trace for each processed receipt",
+    )
+    receipt_precheck_enabled: bool = Field(
+        default=True,
+        description="Skip emails that are obviously not receipts before any LLM call",
+    )
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables.
+
+    The .env file is already loaded into os.environ by ``load_dotenv()``
+    above, so it is not parsed a second time here.
+    """
 
     model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
         env_nested_delimiter="__",
         extra="ignore",
     )
@@ -130,6 +169,15 @@ class Settings(BaseSettings):
     # Orchestrator Settings
     orchestrator: OrchestratorSettings = Field(default_factory=OrchestratorSettings)
 
+    # LLM client
+    llm_max_retries: int = Field(
+        default=4,
+        description=(
+            "Retries for transient LLM API errors (rate limits, timeouts, 5xx) "
+            "with exponential backoff, honoring Retry-After"
+        ),
+    )
+
     # LLM API Keys
     # These fields allow Pydantic to load API keys from the environment (.env)
     # into the `settings` object so other modules can read them without
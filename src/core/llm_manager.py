@@ -5,6 +5,7 @@ instances for different LLM providers using the agents SDK.
 """
 
 import os
+from collections.abc import Iterable
 
 from agents import OpenAIChatCompletionsModel
 from loguru import logger
@@ -23,23 +24,25 @@ class LLMManager:
     def __init__(self) -> None:
         self._models: dict[str, OpenAIChatCompletionsModel] = {}
         self._clients: dict[str, AsyncOpenAI] = {}
+        # Clients keyed by (base_url, api_key_env_var) so providers that hit the
+        # same endpoint with the same key (e.g. openai / openai-gpt4) share one
+        # connection pool instead of opening their own.
+        self._endpoint_clients: dict[tuple[str, str], AsyncOpenAI] = {}
+        # API keys resolved so far, keyed by env var name
+        self._api_keys: dict[str, str] = {}
 
-    def get_model(self, provider: LLMProvider) -> OpenAIChatCompletionsModel | None:
-        """Get or create an OpenAIChatCompletionsModel for the specified provider.
+    def _resolve_api_key(self, config: LLMConfig) -> str | None:
+        """Resolve the API key for a provider config, caching it once found.
 
         Args:
-            provider: The LLM provider key from AVAILABLE_LLMS
+            config: Provider configuration
 
         Returns:
-            OpenAIChatCompletionsModel configured for the provider, or None if API key missing
+            The API key, or None if it is not configured
         """
-        if provider in self._models:
-            return self._models[provider]
-
-        config = AVAILABLE_LLMS.get(provider)
-        if not config:
-            logger.error(f"Unknown LLM provider: {provider}")
-            return None
+        api_key = self._api_keys.get(config.api_key_env_var)
+        if api_key:
+            return api_key
 
         # First try environment variables (os.environ). If the process was
         # started with keys loaded via Pydantic Settings (from a .env file),
@@ -53,18 +56,46 @@ class LLMManager:
             attr_name = config.api_key_env_var.lower()
             api_key = getattr(settings, attr_name, None)
 
+        if api_key:
+            self._api_keys[config.api_key_env_var] = api_key
+        return api_key
+
+    def get_model(self, provider: LLMProvider) -> OpenAIChatCompletionsModel | None:
+        """Get or create an OpenAIChatCompletionsModel for the specified provider.
+
+        Args:
+            provider: The LLM provider key from AVAILABLE_LLMS
+
+        Returns:
+            OpenAIChatCompletionsModel configured for the provider, or None if API key missing
+        """
+        if provider in self._models:
+            return self._models[provider]
+
+        config = AVAILABLE_LLMS.get(provider)
+        if not config:
+            logger.error("Unknown LLM provider: {}", provider)
+            return None
+
+        api_key = self._resolve_api_key(config)
         if not api_key:
             logger.warning(
-                f"API key not found for provider '{provider}' "
-                f"(env var: {config.api_key_env_var})"
+                "API key not found for provider '{}' (env var: {})",
+                provider,
+                config.api_key_env_var,
             )
             return None
 
-        # Create AsyncOpenAI client for the provider
-        client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=config.base_url,
-        )
+        # Reuse the AsyncOpenAI client of any provider sharing this endpoint
+        endpoint = (config.base_url, config.api_key_env_var)
+        client = self._endpoint_clients.get(endpoint)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=config.base_url,
+                max_retries=settings.llm_max_retries,
+            )
+            self._endpoint_clients[endpoint] = client
         self._clients[provider] = client
 
         # Create OpenAIChatCompletionsModel wrapper for agents SDK
@@ -73,7 +104,7 @@ class LLMManager:
             openai_client=client,
         )
         self._models[provider] = model
-        logger.info(f"Created agents SDK model for provider: {provider} ({config.model_name})")
+        logger.info("Created agents SDK model for provider: {} ({})", provider, config.model_name)
 
         return model
 
@@ -119,6 +150,28 @@ class LLMManager:
         """List all available provider keys."""
         return list(AVAILABLE_LLMS.keys())
 
+    def warmup(self, providers: Iterable[LLMProvider]) -> None:
+        """Create the models (and their clients) for the given providers upfront.
+
+        Called at application startup so the first request does not pay
+        for client and model construction.
+
+        Providers without an API key are skipped (get_model logs a warning).
+
+        Args:
+            providers: Provider keys to preload; duplicates are ignored
+        """
+        for provider in dict.fromkeys(providers):
+            self.get_model(provider)
+
+    async def aclose(self) -> None:
+        """Close the shared AsyncOpenAI clients and their connection pools."""
+        for client in self._endpoint_clients.values():
+            await client.close()
+        self._endpoint_clients.clear()
+        self._clients.clear()
+        self._models.clear()
+
     def is_provider_configured(self, provider: LLMProvider) -> bool:
         """Check if a provider has its API key configured.
 
@@ -126,12 +179,12 @@ class LLMManager:
             provider: The LLM provider key
 
         Returns:
-            True if the provider's API key is set in environment
+            True if the provider's API key is set in environment or settings
         """
         config = AVAILABLE_LLMS.get(provider)
         if not config:
             return False
-        return bool(os.getenv(config.api_key_env_var))
+        return bool(self._resolve_api_key(config))
 
 
 # Global singleton instance
@@ -1,16 +1,22 @@
 """Logging configuration using Loguru."""
 
-import os
 import sys
+from pathlib import Path
 
 from loguru import logger
 
+# Repository root (src/core/logging.py -> parents[2])
+BASE_DIR = Path(__file__).resolve().parents[2]
+LOG_DIR = BASE_DIR / "logs"
 
-def setup_logging(log_level: str = "INFO") -> None:
+
+def setup_logging(log_level: str = "INFO", backtrace: bool = True) -> None:
     """Configure the Loguru logger for the application.
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        backtrace: Extend logged tracebacks beyond the catching frame
+            (costlier; meant for debugging)
     """
     log_format = (
         "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
@@ -20,9 +26,7 @@ def setup_logging(log_level: str = "INFO") -> None:
     )
 
     # Create logs directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    log_dir = os.path.join(base_dir, "logs")
-    os.makedirs(log_dir, exist_ok=True)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     # Remove default handler
     logger.remove()
@@ -37,14 +41,14 @@ def setup_logging(log_level: str = "INFO") -> None:
 
     # File handler with rotation
     logger.add(
-        sink=os.path.join(log_dir, "expense_sync_{time}.log"),
+        sink=LOG_DIR / "expense_sync_{time}.log",
         level=log_level.upper(),
         format=log_format,
         rotation="10 MB",
         retention="7 days",
         compression="gz",
         enqueue=True,
-        backtrace=True,
+        backtrace=backtrace,
         diagnose=False,
     )
 
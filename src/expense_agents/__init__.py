@@ -13,7 +13,7 @@ Pattern:
     validator_agent = create_validator_agent()
     persistence_agent = create_persistence_agent()
     categorizer_tool = categorizer_agent.as_tool(tool_name="categorize_expense", ...)
-    validator_tool = validator_agent.as_tool(tool_name="validate_categorization", ...)
+    validator_tool = create_validator_tool(validator_agent)  # merchant-cached
     persistence_tool = persistence_agent.as_tool(tool_name="save_expense", ...)
     orchestrator = Agent(tools=[categorizer_tool, validator_tool, persistence_tool, WebSearchTool()])
     result = await Runner.run(orchestrator, message)
@@ -24,36 +24,40 @@ from src.expense_agents.orchestrator import (
     create_expense_orchestrator,
     create_persistence_agent,
     create_validator_agent,
+    create_validator_tool,
     process_receipt_with_agents,
+    process_receipts_batch,
 )
 from src.expense_agents.prompts import (
     CATEGORIZER_SYSTEM_PROMPT,
+    CATEGORIZER_TOOL_DESCRIPTION,
     ORCHESTRATOR_SYSTEM_PROMPT,
     PERSISTENCE_SYSTEM_PROMPT,
+    PERSISTENCE_TOOL_DESCRIPTION,
+    VALIDATOR_TOOL_DESCRIPTION,
     get_validator_prompt,
     load_business_rules,
 )
-from src.expense_agents.tools import (
-    get_next_row,
-    get_ranges,
-    write_range,
-)
+from src.expense_agents.tools import append_expense
 
 __all__ = [
     # Orchestrator
     "create_categorizer_agent",
     "create_validator_agent",
+    "create_validator_tool",
     "create_persistence_agent",
     "create_expense_orchestrator",
     "process_receipt_with_agents",
+    "process_receipts_batch",
     # Prompts
     "CATEGORIZER_SYSTEM_PROMPT",
     "ORCHESTRATOR_SYSTEM_PROMPT",
     "PERSISTENCE_SYSTEM_PROMPT",
+    "CATEGORIZER_TOOL_DESCRIPTION",
+    "VALIDATOR_TOOL_DESCRIPTION",
+    "PERSISTENCE_TOOL_DESCRIPTION",
     "get_validator_prompt",
     "load_business_rules",
-    # MCP Tools
-    "get_next_row",
-    "get_ranges",
-    "write_range",
+    # Function Tools
+    "append_expense",
 ]
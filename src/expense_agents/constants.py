@@ -17,27 +17,21 @@ TOOL_SAVE_EXPENSE = "save_expense"
 """Tool name for the persistence agent (PersistenciaGastos)."""
 
 
-# --- MCP Function Tool Names ---
+# --- Function Tool Names ---
 # These are the names of @function_tool decorated functions
 
-TOOL_GET_RANGES = "get_ranges"
-"""Function tool for reading Google Sheets ranges via MCP."""
-
-TOOL_WRITE_RANGE = "write_range"
-"""Function tool for writing to Google Sheets via MCP."""
+TOOL_APPEND_EXPENSE = "append_expense"
+"""Function tool for appending an expense row after the last filled row."""
 
 
 # --- Tool Collections ---
 
-AGENT_TOOLS = [
+AGENT_TOOLS = (
     TOOL_CATEGORIZE_EXPENSE,
     TOOL_VALIDATE_CATEGORIZATION,
     TOOL_SAVE_EXPENSE,
-]
-"""List of all agent-based tools (created via .as_tool())."""
-
-FUNCTION_TOOLS = [
-    TOOL_GET_RANGES,
-    TOOL_WRITE_RANGE,
-]
-"""List of all function tools (created via @function_tool decorator)."""
+)
+"""All agent-based tools (created via .as_tool())."""
+
+FUNCTION_TOOLS = (TOOL_APPEND_EXPENSE,)
+"""All function tools (created via @function_tool decorator)."""
@@ -7,23 +7,34 @@ passed to a main orchestrator agent.
 Architecture:
 1. Categorizer Agent (GPT): Extracts and categorizes expenses from email text
 2. Validator Agent (Gemini): Validates categorization with business rules
-3. Persistence Agent: Writes to Google Sheets via MCP (get_ranges, write_range)
+   (recurring merchants already approved are answered from the merchant cache)
+3. Persistence Agent: Writes to Google Sheets via MCP (append_expense)
 4. Orchestrator: Coordinates all agents + WebSearchTool for unknown merchants
 
 Pattern:
     categorizer_tool = categorizer_agent.as_tool(...)
-    validator_tool = validator_agent.as_tool(...)
+    validator_tool = create_validator_tool(validator_agent)
     persistence_tool = persistence_agent.as_tool(...)
     orchestrator = Agent(tools=[categorizer_tool, validator_tool, persistence_tool, WebSearchTool()])
     result = await Runner.run(orchestrator, message)
 """
 
+import asyncio
 from functools import lru_cache
 
-from agents import Agent, ModelSettings, Runner, trace
+from agents import (
+    Agent,
+    ModelSettings,
+    OpenAIChatCompletionsModel,
+    RunContextWrapper,
+    Runner,
+    Tool,
+    function_tool,
+    trace,
+)
 from loguru import logger
 
-from src.core.configs import settings
+from src.core.configs import LLMProvider, settings
 from src.core.llm_manager import llm_manager
 from src.expense_agents.constants import (
     TOOL_CATEGORIZE_EXPENSE,
@@ -32,22 +43,64 @@ from src.expense_agents.constants import (
 )
 from src.expense_agents.prompts import (
     CATEGORIZER_SYSTEM_PROMPT,
+    CATEGORIZER_TOOL_DESCRIPTION,
     ORCHESTRATOR_SYSTEM_PROMPT,
     PERSISTENCE_SYSTEM_PROMPT,
+    PERSISTENCE_TOOL_DESCRIPTION,
+    VALIDATOR_TOOL_DESCRIPTION,
     get_validator_prompt,
 )
-from src.expense_agents.tools import get_next_row, get_ranges, write_range
+from src.expense_agents.tools import (
+    append_expense,
+    appended_ranges,
+    prefetch_next_row,
+    track_appends,
+)
 from src.models.schemas import (
     CategorizedExpense,
     OrchestratorResult,
     ProcessingStatus,
+    ProcessReceiptRequest,
     ProcessReceiptResponse,
     ValidationResult,
 )
+from src.services.merchant_cache import merchant_cache
+from src.services.receipt_precheck import looks_like_receipt
+
+# Shared, read-only model settings for the agents
+_LOW_TEMPERATURE_SETTINGS = ModelSettings(temperature=0.1)
+_DETERMINISTIC_SETTINGS = ModelSettings(temperature=0.0)
+
+# Validator tool result for merchant-cache hits, encoded once
+_TRUSTED_VALIDATION = ValidationResult(is_valid=True).model_dump_json()
+
+# How long a receipt that hit its deadline waits for a sheet write in flight
+_DEADLINE_WRITE_GRACE_SECONDS = 2.0
+
+
+def _resolve_model(provider: LLMProvider, role: str) -> OpenAIChatCompletionsModel:
+    """Get the model for a provider, failing loudly if it is not configured.
+
+    Args:
+        provider: LLM provider key
+        role: Agent role, used in the error message
+
+    Returns:
+        The provider's OpenAIChatCompletionsModel
+    """
+    model = llm_manager.get_model(provider)
+
+    if not model:
+        raise RuntimeError(
+            f"Could not create model for {role} provider: {provider}. "
+            f"Check that the API key is configured."
+        )
+
+    return model
 
 
 # --- Specialized Agents ---
-def create_categorizer_agent() -> Agent:
+def create_categorizer_agent(model: OpenAIChatCompletionsModel | None = None) -> Agent:
     """Create the receipt categorizer agent (GPT) with Structured Output.
 
     This agent specializes in extracting structured expense data from
@@ -56,79 +109,117 @@ def create_categorizer_agent() -> Agent:
     Uses output_type=CategorizedExpense to enforce structured, validated output
     directly from the LLM, eliminating manual JSON parsing.
 
+    Args:
+        model: Model to use; defaults to the configured categorizer provider
+
     Returns:
         Agent configured with GPT model for categorization and structured output
     """
-    provider = settings.orchestrator.categorizer_provider
-    model = llm_manager.get_model(provider)
-
-    if not model:
-        raise RuntimeError(
-            f"Could not create model for categorizer provider: {provider}. "
-            f"Check that the API key is configured."
-        )
+    if model is None:
+        model = _resolve_model(settings.orchestrator.categorizer_provider, "categorizer")
 
     return Agent(
         name="CategorizadorGastos",
         instructions=CATEGORIZER_SYSTEM_PROMPT,
         model=model,
-        model_settings=ModelSettings(temperature=0.1),
+        model_settings=_LOW_TEMPERATURE_SETTINGS,
         output_type=CategorizedExpense,
     )
 
 
-def create_validator_agent() -> Agent:
+def create_validator_agent(model: OpenAIChatCompletionsModel | None = None) -> Agent:
     """Create the expense validator agent (Gemini).
 
     This agent validates categorized expenses against business rules
     and provides corrections if needed.
 
+    Args:
+        model: Model to use; defaults to the configured validator provider
+
     Returns:
         Agent configured with Gemini model for validation
     """
-    provider = settings.orchestrator.validator_provider
-    model = llm_manager.get_model(provider)
-
-    if not model:
-        raise RuntimeError(
-            f"Could not create model for validator provider: {provider}. "
-            f"Check that the API key is configured."
-        )
+    if model is None:
+        model = _resolve_model(settings.orchestrator.validator_provider, "validator")
 
     return Agent(
         name="ValidadorGastos",
         instructions=get_validator_prompt(),
         model=model,
-        model_settings=ModelSettings(temperature=0.0),
+        model_settings=_DETERMINISTIC_SETTINGS,
         output_type=ValidationResult,
     )
 
 
-def create_persistence_agent() -> Agent:
+def create_persistence_agent(model: OpenAIChatCompletionsModel | None = None) -> Agent:
     """Create the persistence agent for Google Sheets.
 
     This agent handles writing expenses to Google Sheets via MCP tools.
-    It uses get_ranges to find the next empty row and write_range to persist.
+    It formats the expense as a sheet row and persists it with append_expense,
+    which computes the next empty row in Python.
+
+    Args:
+        model: Model to use; defaults to the orchestrator's provider
 
     Returns:
         Agent configured with MCP tools for Google Sheets
     """
-    provider = settings.orchestrator.llm_provider
-    model = llm_manager.get_model(provider)
-
-    if not model:
-        raise RuntimeError(
-            f"Could not create model for persistence provider: {provider}. "
-            f"Check that the API key is configured."
-        )
+    if model is None:
+        model = _resolve_model(settings.orchestrator.llm_provider, "persistence")
 
     return Agent(
         name="PersistenciaGastos",
         instructions=PERSISTENCE_SYSTEM_PROMPT,
         model=model,
-        model_settings=ModelSettings(temperature=0.0),
-        tools=[get_next_row, get_ranges, write_range],
+        model_settings=_DETERMINISTIC_SETTINGS,
+        tools=[append_expense],
+    )
+
+
+def create_validator_tool(validator_agent: Agent) -> Tool:
+    """Expose the validator agent as a tool backed by the merchant cache.
+
+    Equivalent to validator_agent.as_tool(), but recurring merchants whose
+    categorization the validator has already approved repeatedly are
+    answered locally, skipping the validator LLM call. Every validator
+    verdict is fed back into the cache.
+
+    Args:
+        validator_agent: The ValidadorGastos agent
+
+    Returns:
+        Function tool named TOOL_VALIDATE_CATEGORIZATION
+    """
+
+    @function_tool(
+        name_override=TOOL_VALIDATE_CATEGORIZATION,
+        description_override=VALIDATOR_TOOL_DESCRIPTION,
     )
+    async def validate_categorization(
+        context: RunContextWrapper,
+        descripcion: str,
+        categoria: str,
+        tipo: str,
+    ) -> str:
+        if merchant_cache.is_trusted(descripcion, categoria, tipo):
+            logger.info("Validation answered from merchant cache: {}", descripcion)
+            return _TRUSTED_VALIDATION
+
+        result = await Runner.run(
+            starting_agent=validator_agent,
+            input=f"descripcion: {descripcion}\ncategoria: {categoria}\ntipo: {tipo}",
+            context=context.context,
+        )
+        validation: ValidationResult = result.final_output
+
+        if validation.is_valid:
+            merchant_cache.record_approval(descripcion, categoria, tipo)
+        else:
+            merchant_cache.record_rejection(descripcion)
+
+        return validation.model_dump_json()
+
+    return validate_categorization
 
 
 # --- Main Orchestrator Setup ---
@@ -148,74 +239,92 @@ def create_expense_orchestrator() -> Agent:
     Returns:
         Configured orchestrator Agent with all tools
     """
+    # The orchestrator and persistence agent share a provider, so resolve
+    # its model once
+    orchestrator_model = _resolve_model(settings.orchestrator.llm_provider, "orchestrator")
+
     # Create specialized agents
     categorizer_agent = create_categorizer_agent()
     validator_agent = create_validator_agent()
-    persistence_agent = create_persistence_agent()
+    persistence_agent = create_persistence_agent(orchestrator_model)
 
     # Convert agents to tools using .as_tool()
     categorizer_tool = categorizer_agent.as_tool(
         tool_name=TOOL_CATEGORIZE_EXPENSE,
-        tool_description=(
-            "Extrae y categoriza los datos de un gasto desde el texto de un email/notificación bancaria. "
-            "Devuelve un objeto estructurado con: fecha (DD/MM/YYYY), tipo (Gasto/Ingreso), categoria, importe (con coma decimal), descripcion. "
-            "Pásale el contenido completo del email o notificación. "
-            "Si la validación falla, llama de nuevo a esta herramienta pasando el mensaje de error (feedback) "
-            "junto con el texto original para corregirlo. Formato: 'FEEDBACK: [mensaje de error]\\nTEXTO ORIGINAL: [texto]'"
-        ),
+        tool_description=CATEGORIZER_TOOL_DESCRIPTION,
     )
 
-    validator_tool = validator_agent.as_tool(
-        tool_name=TOOL_VALIDATE_CATEGORIZATION,
-        tool_description=(
-            "Valida si la categorización de un gasto es correcta según las reglas de negocio. "
-            "Pásale los datos del gasto: descripcion, categoria, tipo. "
-            "Devuelve: is_valid, feedback, corrected_category, corrected_type."
-        ),
-    )
+    validator_tool = create_validator_tool(validator_agent)
 
     persistence_tool = persistence_agent.as_tool(
         tool_name=TOOL_SAVE_EXPENSE,
-        tool_description=(
-            "Guarda un gasto validado en Google Sheets. "
-            "Pásale los datos completos del gasto: fecha, tipo, categoria, importe, descripcion. "
-            "Primero lee las filas existentes para encontrar la siguiente fila vacía, luego escribe."
-        ),
+        tool_description=PERSISTENCE_TOOL_DESCRIPTION,
     )
 
     # Combine agent-tools with utility tools
     tools = [
         categorizer_tool,      # Agent as tool (.as_tool())
-        validator_tool,        # Agent as tool (.as_tool())
+        validator_tool,        # Agent as tool (merchant-cached)
         persistence_tool       # Agent as tool (.as_tool())
                                # For unknown merchants
     ]
 
-    # Get orchestrator model
-    provider = settings.orchestrator.llm_provider
-    model = llm_manager.get_model(provider)
-
-    if not model:
-        raise RuntimeError(
-            f"Could not create model for orchestrator provider: {provider}. "
-            f"Check that the API key is configured."
-        )
-
     return Agent(
         name="GestorGastos",
         instructions=ORCHESTRATOR_SYSTEM_PROMPT,
-        model=model,
-        model_settings=ModelSettings(temperature=0.1),
+        model=orchestrator_model,
+        model_settings=_LOW_TEMPERATURE_SETTINGS,
         tools=tools,
         output_type=OrchestratorResult,
     )
 
 
 # --- Main Processing Function ---
+async def _deadline_response(
+    appends: list[asyncio.Task[str]],
+) -> ProcessReceiptResponse:
+    """Build the response for a receipt whose deadline fired.
+
+    Sheet writes are shielded from the deadline, so the row may already be
+    saved (or still being saved): report it, so the caller does not retry
+    into a duplicate row. Writes still running after a short grace period
+    are reported as unknown rather than waited for.
+    """
+    logger.error(
+        "Orchestrator exceeded deadline of {}s",
+        settings.orchestrator.deadline_seconds,
+    )
+    written, unfinished = await appended_ranges(appends, _DEADLINE_WRITE_GRACE_SECONDS)
+    if written:
+        return ProcessReceiptResponse(
+            status=ProcessingStatus.SUCCESS,
+            message=f"Gasto guardado en {', '.join(written)} (tiempo máximo superado tras guardar)",
+            attempts=1,
+            errors=["deadline_exceeded"],
+        )
+    if unfinished:
+        return ProcessReceiptResponse(
+            status=ProcessingStatus.ERROR,
+            message=(
+                "El procesamiento superó el tiempo máximo permitido con una "
+                "escritura en curso; comprueba la hoja antes de reintentar."
+            ),
+            attempts=1,
+            errors=["deadline_exceeded", "write_state_unknown"],
+        )
+    return ProcessReceiptResponse(
+        status=ProcessingStatus.ERROR,
+        message="El procesamiento superó el tiempo máximo permitido.",
+        attempts=1,
+        errors=["deadline_exceeded"],
+    )
+
+
 async def process_receipt_with_agents(
     email_body: str,
     email_subject: str | None = None,
     sender: str | None = None,
+    prefetch: bool = True,
 ) -> ProcessReceiptResponse:
     """Process a receipt email using the agent-based workflow.
 
@@ -226,31 +335,61 @@ async def process_receipt_with_agents(
         email_body: Raw email body content
         email_subject: Optional email subject
         sender: Optional sender address
+        prefetch: Read the sheet while the agents run; disable when other
+            receipts may write rows in the meantime
 
     Returns:
         ProcessReceiptResponse with the processing result
     """
     logger.info("Starting agent-based receipt processing")
 
+    if settings.orchestrator.receipt_precheck_enabled and not looks_like_receipt(
+        email_body, email_subject
+    ):
+        logger.info("Email does not look like a receipt, skipping agents")
+        return ProcessReceiptResponse(
+            status=ProcessingStatus.SKIPPED,
+            message="El email no parece un movimiento bancario o recibo",
+            attempts=0,
+            errors=[],
+        )
+
     # Build the message for the orchestrator
-    context_parts = []
-    if sender:
-        context_parts.append(f"De: {sender}")
-    if email_subject:
-        context_parts.append(f"Asunto: {email_subject}")
-    context_parts.append(f"\nContenido del email:\n\n{email_body}")
-
-    message = f"""Procesa el siguiente movimiento bancario/recibo y guárdalo en Google Sheets:
-    {chr(10).join(context_parts)}
-    """
+    sender_line = f"De: {sender}\n" if sender else ""
+    subject_line = f"Asunto: {email_subject}\n" if email_subject else ""
+    message = (
+        "Procesa el siguiente movimiento bancario/recibo y guárdalo en Google Sheets:\n"
+        f"{sender_line}{subject_line}\nContenido del email:\n\n{email_body}\n"
+    )
 
     # Create the orchestrator with all tools
     orchestrator = create_expense_orchestrator()
+    appends = track_appends()
+    prefetched: asyncio.Task | None = None
 
     try:
+        # Speculatively read the sheet while the agents categorize/validate;
+        # the persistence agent's append_expense picks up the result
+        if prefetch:
+            prefetched = prefetch_next_row()
+
         # Single Runner.run() call - the orchestrator handles the full workflow
-        with trace("ExpenseProcessing"):
-            result = await Runner.run(orchestrator, message)
+        # Bounded by a wall-clock deadline; cancellation propagates to the
+        # running agent/tool calls. A disabled trace is a no-op that nested
+        # runs reuse, so no spans are recorded at all.
+        deadline = asyncio.timeout(settings.orchestrator.deadline_seconds)
+        try:
+            with trace(
+                "ExpenseProcessing",
+                disabled=not settings.orchestrator.tracing_enabled,
+            ):
+                async with deadline:
+                    result = await Runner.run(orchestrator, message)
+        except TimeoutError:
+            # A TimeoutError raised inside a tool or the SDK is a plain error
+            if not deadline.expired():
+                raise
+            return await _deadline_response(appends)
 
         # Get structured output from the orchestrator
         orchestrator_result: OrchestratorResult = result.final_output
@@ -264,17 +403,17 @@ async def process_receipt_with_agents(
                 errors=["No output from orchestrator"],
             )
 
-        logger.info(f"Orchestrator finished. Success: {orchestrator_result.success}")
+        logger.info("Orchestrator finished. Success: {}", orchestrator_result.success)
 
         # Map OrchestratorResult to ProcessReceiptResponse
         if orchestrator_result.success:
             # Build success message
-            if orchestrator_result.sheet_row and orchestrator_result.expense_data:
+            expense = orchestrator_result.expense_data
+            if orchestrator_result.sheet_row and expense:
                 message = (
                     f"Gasto guardado exitosamente en {orchestrator_result.sheet_row}: "
-                    f"{orchestrator_result.expense_data.descripcion} - "
-                    f"{orchestrator_result.expense_data.importe}€ "
-                    f"({orchestrator_result.expense_data.categoria})"
+                    f"{expense.descripcion} - {expense.importe}€ "
+                    f"({expense.categoria.value})"
                 )
             else:
                 message = "Gasto procesado exitosamente"
@@ -282,14 +421,14 @@ async def process_receipt_with_agents(
             return ProcessReceiptResponse(
                 status=ProcessingStatus.SUCCESS,
                 message=message,
-                data=orchestrator_result.expense_data,
+                data=expense,
                 attempts=1,
                 errors=[],
             )
         else:
             # Handle error case
             error_msg = orchestrator_result.error_message or "Error desconocido en el procesamiento"
-            logger.error(f"Orchestrator reported error: {error_msg}")
+            logger.error("Orchestrator reported error: {}", error_msg)
 
             return ProcessReceiptResponse(
                 status=ProcessingStatus.ERROR,
@@ -300,7 +439,7 @@ async def process_receipt_with_agents(
             )
 
     except Exception as e:
-        logger.exception(f"Error in orchestrator: {e}")
+        logger.exception("Error in orchestrator: {}", e)
         return ProcessReceiptResponse(
             status=ProcessingStatus.ERROR,
             message="Error interno del servidor. Por favor, inténtalo de nuevo.",
@@ -308,4 +447,48 @@ async def process_receipt_with_agents(
             errors=["internal_server_error"],
         )
 
+    finally:
+        # No-op if append_expense consumed the read; otherwise (error, max
+        # turns, deadline, no save) stop the orphaned MCP call
+        if prefetched is not None and not prefetched.done():
+            prefetched.cancel()
+
+
+async def process_receipts_batch(
+    receipts: list[ProcessReceiptRequest],
+) -> list[ProcessReceiptResponse]:
+    """Process several receipt emails in a single call.
+
+    Up to settings.orchestrator.max_concurrency receipts run through the
+    cached orchestrator at the same time; only their Google Sheets writes
+    are serialized (see append_expense), so rows never collide.
+    A failure in one receipt is reported in its own response and does not
+    stop the rest of the batch.
+
+    Args:
+        receipts: Receipt emails to process
+
+    Returns:
+        One ProcessReceiptResponse per receipt, in the same order
+    """
+    logger.info("Starting batch processing of {} receipts", len(receipts))
+
+    semaphore = asyncio.Semaphore(settings.orchestrator.max_concurrency)
+    # Concurrent receipts write rows while the others are still running,
+    # which would invalidate every prefetched read
+    prefetch = settings.orchestrator.max_concurrency == 1 or len(receipts) == 1
+
+    async def process_one(receipt: ProcessReceiptRequest) -> ProcessReceiptResponse:
+        async with semaphore:
+            return await process_receipt_with_agents(
+                email_body=receipt.email_body,
+                email_subject=receipt.email_subject,
+                sender=receipt.sender,
+                prefetch=prefetch,
+            )
+
+    results = await asyncio.gather(*(process_one(r) for r in receipts))
 
+    succeeded = sum(r.status == ProcessingStatus.SUCCESS for r in results)
+    logger.info("Batch finished: {}/{} receipts succeeded", succeeded, len(results))
+    return results
@@ -5,13 +5,16 @@ This module contains all the prompt templates used by the agents:
 - Validator Agent (Gemini): Validates categorization with business rules
 - Persistence Agent: Writes to Google Sheets via MCP
 - Orchestrator: Coordinates all agents
+- Tool descriptions for the agents exposed via .as_tool()
 """
 
+from functools import cache
 from pathlib import Path
 
 
+@cache
 def load_business_rules() -> str:
-    """Load business rules from external file."""
+    """Load business rules from external file (read once per process)."""
     rules_path = Path(__file__).parent / "business_rules.txt"
     if rules_path.exists():
         return rules_path.read_text(encoding="utf-8")
@@ -79,10 +82,6 @@ VALIDATOR_SYSTEM_PROMPT_TEMPLATE = """Eres un validador experto de categorizaci
 
 Recibirás los datos de un gasto ya categorizado y debes validar si la categoría asignada es correcta.
 
-## Reglas de Negocio del Usuario
-
-{business_rules}
-
 ## Proceso de Validación
 
 1. Revisa si la categoría asignada tiene sentido para el comercio/descripción
@@ -124,57 +123,35 @@ Recibirás los datos de un gasto ya categorizado y debes validar si la categorí
 **Ejemplo 3: Tipo incorrecto**
 - Entrada: descripcion="Bizum Paula", categoria="Otros", tipo="Gasto"
 - Resultado: is_valid=false, feedback="Un Bizum recibido es un Ingreso, no un Gasto", corrected_type="Ingreso"
+
+## Reglas de Negocio del Usuario
+
+{business_rules}
 """
 
 
+@cache
 def get_validator_prompt() -> str:
-    """Get the validator prompt with business rules injected."""
+    """Get the validator prompt with business rules injected (rendered once)."""
     rules = load_business_rules()
     return VALIDATOR_SYSTEM_PROMPT_TEMPLATE.format(business_rules=rules)
 
 
 # --- PERSISTENCE AGENT ---
-PERSISTENCE_SYSTEM_PROMPT = """
-## A. Role/Persona
-Eres un "Data Integrity Architect" de alta precisión, especializado en la persistencia de datos en Google Sheets. Tu función es actuar como un controlador de flujo que transfiere datos de forma exacta entre herramientas, garantizando que nunca se sobrescriba información existente mediante el uso estricto de identificadores dinámicos.
-
-## B. Core Instruction
-Debes ejecutar un protocolo de dos pasos obligatorios y secuenciales para cada registro: primero, obtener el índice de la fila disponible mediante `get_next_row` y, segundo, escribir los datos utilizando el rango exacto devuelto por dicha herramienta. Tienes prohibido realizar cálculos matemáticos o deducciones lógicas sobre la ubicación de las filas; tu labor es de ejecución y transporte de parámetros.
-
-## C. Context/Goal
-El objetivo es registrar gastos e ingresos en una hoja de cálculo sin errores de solapamiento. Dado que el cálculo de la fila se realiza en el backend mediante código Python, tu responsabilidad es actuar como un "pasamanos" ciego pero preciso de la variable `range_to_write`.
-
-## D. Constraints
-* **Protocolo de Herramientas:**
-    1.  **Llamada Obligatoria:** Ejecuta siempre `get_next_row(range="Gastos!A1:E500")` antes de cualquier escritura. El rango `A1:E500` es mandatorio para asegurar la captura total del dataset.
-    2.  **Uso de Parámetros:** Extrae la clave `range_to_write` de la respuesta JSON y pásala sin modificaciones a la función `write_range`.
-* **Prohibiciones Críticas:**
-    * **NO** realices cálculos manuales (ej. no hagas `+1` a ningún número).
-    * **NO** utilices números de filas vistos en ejemplos o sesiones previas.
-    * **NO** intentes usar `get_ranges` para contar filas manualmente.
-* **Formato de Datos (Strict Schema):**
-    * **Fecha:** Formato "DD/MM/YYYY".
-    * **Tipo:** Únicamente "Gasto" o "Ingreso".
-    * **Importe:** String con coma decimal y **SIN** el símbolo de moneda (ej: "45,99").
-    * **Notas:** Estructura "Nombre - Descripción".
-
-## E. Output Format & Workflow (Sequential Logic)
-
-Para cada solicitud de guardado, sigue este flujo lógico interno:
-
-1.  **FASE DE IDENTIFICACIÓN:**
-    * Acción: `get_next_row("Gastos!A1:E500")`
-    * Espera: Recibir `{"range_to_write": "Gastos!AX:EX", ...}`
-
-2.  **FASE DE PERSISTENCIA:**
-    * Acción: `write_range(range_to_write_RECIBIDO, [[datos_formateados]])`
-
-### Ejemplo Estructural (No usar estos valores reales):
-* **Si la herramienta devuelve:** `"range_to_write": "Gastos!A123:E123"`
-* **Tu acción debe ser:** `write_range("Gastos!A123:E123", [[...]])`
-
-## REGLA ABSOLUTA
-El valor de `range_to_write` es una constante temporal proporcionada por el sistema. Ignora cualquier sesgo hacia números de filas anteriores. Si la herramienta dice que la fila es la 70, escribes en la 70; si dice 500, escribes en la 500. El cálculo reside en el código, la ejecución reside en ti.
+PERSISTENCE_SYSTEM_PROMPT = """Eres el agente de persistencia de gastos en Google Sheets.
+
+Recibirás los datos de un gasto ya validado. Llama UNA sola vez a `append_expense` con la fila en este orden de columnas:
+[fecha, tipo, categoria, importe, descripcion]
+
+## Formato de los Valores
+- **fecha**: "DD/MM/YYYY"
+- **tipo**: únicamente "Gasto" o "Ingreso"
+- **categoria**: la categoría validada
+- **importe**: string con coma decimal y SIN símbolo de moneda (ej: "45,99")
+- **descripcion**: "Nombre - Descripción"
+
+La herramienta calcula la fila libre y escribe en ella: nunca calcules ni indiques números de fila.
+Responde con el rango devuelto (`range`) si `success` es true, o con el error si es false.
 """
 
 # --- ORCHESTRATOR AGENT ---
@@ -239,3 +216,25 @@ Debes devolver un objeto con estos campos:
   "sheet_row": null
 }
 """
+
+
+# --- TOOL DESCRIPTIONS (.as_tool()) ---
+CATEGORIZER_TOOL_DESCRIPTION = (
+    "Extrae y categoriza los datos de un gasto desde el texto de un email/notificación bancaria. "
+    "Devuelve un objeto estructurado con: fecha (DD/MM/YYYY), tipo (Gasto/Ingreso), categoria, importe (con coma decimal), descripcion. "
+    "Pásale el contenido completo del email o notificación. "
+    "Si la validación falla, llama de nuevo a esta herramienta pasando el mensaje de error (feedback) "
+    "junto con el texto original para corregirlo. Formato: 'FEEDBACK: [mensaje de error]\\nTEXTO ORIGINAL: [texto]'"
+)
+
+VALIDATOR_TOOL_DESCRIPTION = (
+    "Valida si la categorización de un gasto es correcta según las reglas de negocio. "
+    "Pásale los datos del gasto: descripcion, categoria, tipo. "
+    "Devuelve: is_valid, feedback, corrected_category, corrected_type."
+)
+
+PERSISTENCE_TOOL_DESCRIPTION = (
+    "Guarda un gasto validado en Google Sheets. "
+    "Pásale los datos completos del gasto: fecha, tipo, categoria, importe, descripcion. "
+    "Lo añade en la siguiente fila libre y devuelve el rango escrito."
+)
@@ -1,216 +1,265 @@
 """Function tools for the expense processing agents.
 
-These are MCP tools that complement the agent-based tools created via .as_tool()
-in orchestrator.py. They provide Google Sheets persistence functionality.
+These are local @function_tool tools that complement the agent-based tools
+created via .as_tool() in orchestrator.py. They provide Google Sheets
+persistence on top of the MCP server's get_ranges/write_range tools.
 
 Tools:
-- write_range: Write data to Google Sheets via MCP
-- get_ranges: Read data from Google Sheets via MCP
+- append_expense: Append one expense row after the last filled row (used by
+  the persistence agent; the row is computed in Python)
 
 Note: Validation is handled by the ValidadorGastos agent (via .as_tool()),
 not by a separate @function_tool. This avoids redundancy in the system.
 """
 
+import asyncio
 import json
+from contextvars import ContextVar
+from typing import Any
 
 from agents import function_tool
 from loguru import logger
 
+from src.core.configs import settings
 from src.services.mcp_client import mcp_client
 
+# Range read to find the next empty row (append_expense). All five columns
+# are read: the sheet is also edited by hand, and a row with an empty
+# column A but data in B-E must still count, or it would be overwritten.
+NEXT_ROW_RANGE = "Gastos!A1:E500"
 
-# --- MCP Tools for Google Sheets ---
-@function_tool
-async def write_range(
-    range: str,
-    values: list[list[str]],
-) -> str:
-    """Write data to Google Sheets via MCP server.
+# Row written by append_expense: fecha, tipo, categoria, importe, descripcion
+EXPENSE_ROW_RANGE = "Gastos!A{row}:E{row}"
+
+# Constant tool result, encoded once
+_NEXT_ROW_UNKNOWN = json.dumps({
+    "success": False,
+    "error": "Could not determine next row number",
+})
+
+# Speculative read of the sheet started when a request arrives, so it runs
+# while the categorizer/validator agents are still working. Tools run in
+# tasks that copy the request's context, so the row lookup sees it.
+_prefetched_read: ContextVar[tuple[str, int, asyncio.Task] | None] = ContextVar(
+    "_prefetched_read", default=None
+)
+
+# Bumped when a sheet write starts and again when it ends. A prefetched read
+# is only reused if no write started or ended since it started, otherwise
+# its row count may be stale (another receipt was appended concurrently,
+# possibly while the read itself was in flight).
+_sheet_version = 0
+
+# Serializes append_expense's read -> write sequence across concurrent
+# receipts so two of them never compute and write the same sheet row.
+_append_lock = asyncio.Lock()
+
+# append_expense calls of the current request, so a request that hits its
+# deadline can still report rows that were written.
+_tracked_appends: ContextVar[list[asyncio.Task[str]] | None] = ContextVar(
+    "_tracked_appends", default=None
+)
 
-    Use this tool to persist expense data to the Google Sheets document.
-    Before writing, you should use get_ranges to find the next empty row.
+
+def prefetch_next_row(range_to_read: str = NEXT_ROW_RANGE) -> asyncio.Task:
+    """Start reading the sheet in the background for a later row lookup.
+
+    The read has no dependency on the categorized expense, so it can overlap
+    with the LLM calls that precede persistence. Must be called from the
+    request's task, before Runner.run().
 
     Args:
-        range: Sheet range in A1 notation (e.g., "Gastos!A55:E55")
-        values: 2D array of values to write (e.g., [["05/11/2025", "Gasto", "Otros", "362,67", "IRPF 2024"]])
+        range_to_read: Range the row lookup is expected to read
 
     Returns:
-        JSON with success status and details
+        The read task, for the caller to cancel if it is never used
     """
-    logger.info(f"write_range called: {range}")
-    logger.debug(f"Values: {values}")
-
-    if not mcp_client.is_connected:
-        logger.warning("MCP server not connected, attempting to establish connection")
+    task = asyncio.create_task(
+        mcp_client.call_tool("get_ranges", {"range": [range_to_read]})
+    )
+    _prefetched_read.set((range_to_read, _sheet_version, task))
+    return task
+
+
+async def _read_for_next_row(range_to_read: str) -> dict[str, Any]:
+    """Read range_to_read via MCP, reusing a matching prefetched read."""
+    prefetched = _prefetched_read.get()
+    if prefetched and prefetched[0] == range_to_read:
+        _, version, task = prefetched
+        if version == _sheet_version:
+            logger.debug("Using prefetched read for {}", range_to_read)
+            return await task
+        logger.debug("Discarding stale prefetched read for {}", range_to_read)
+        task.cancel()
+
+    return await mcp_client.call_tool(
+        "get_ranges",
+        {
+            "range": [range_to_read],
+        }
+    )
+
+
+def _next_row_from_read(result: dict[str, Any]) -> int | None:
+    """Compute the next empty row from a successful MCP get_ranges result.
 
+    Returns:
+        1 + the number of rows read, or None if the response holds no rows
+    """
+    data = result.get("data") or result
+    if isinstance(data, dict):
+        value_ranges = data.get("ValueRanges", [])
+        if value_ranges:
+            values = value_ranges[0].get("Values", [])
+            if values:
+                logger.info("Calculated next_row: {} (from {} existing rows)", len(values) + 1, len(values))
+                return len(values) + 1
+    return None
+
+
+async def _write_values(a1_range: str, values: list[list[str]]) -> dict[str, Any]:
+    """Write values via MCP, marking prefetched reads that overlap it stale."""
+    global _sheet_version
+
+    _sheet_version += 1
     try:
-        result = await mcp_client.call_tool(
+        return await mcp_client.call_tool(
             "write_range",
             {
-                "range": range,
+                "range": a1_range,
                 "values": values,
             }
         )
+    finally:
+        # Even a failed or timed-out write may have landed
+        _sheet_version += 1
+
 
-        if result.get("success"):
-            logger.info(f"Successfully wrote to {range}")
-            return json.dumps({
-                "success": True,
-                "range": range,
-                "rows_written": len(values),
-                "message": f"Datos guardados en {range}",
-            })
+async def _append_row(values: list[str]) -> str:
+    """Read the sheet, compute the next empty row and write values there.
+
+    Returns:
+        JSON with success status and the range written
+    """
+    a1_range = None
+    try:
+        # Only the read -> write sequence is serialized, so concurrent
+        # receipts never compute and write the same sheet row. Bounded so a
+        # hung MCP call cannot hold the lock for every later receipt.
+        async with _append_lock, asyncio.timeout(settings.mcp.append_timeout):
+            result = await _read_for_next_row(NEXT_ROW_RANGE)
+            if not result.get("success"):
+                error = result.get("error", "Error reading sheet data")
+                logger.error("Failed to read ranges: {}", error)
+                return json.dumps({
+                    "success": False,
+                    "error": error,
+                })
+
+            next_row = _next_row_from_read(result)
+            if next_row is None:
+                return _NEXT_ROW_UNKNOWN
+
+            a1_range = EXPENSE_ROW_RANGE.format(row=next_row)
+            result = await _write_values(a1_range, [values])
+
+            if result.get("success"):
+                logger.info("Successfully wrote to {}", a1_range)
+                return json.dumps({
+                    "success": True,
+                    "range": a1_range,
+                    "message": f"Datos guardados en {a1_range}",
+                })
+            else:
+                error = result.get("error", "Error desconocido del servidor MCP")
+                logger.error("MCP write_range failed: {}", error)
+                return json.dumps({
+                    "success": False,
+                    "error": error,
+                })
+
+    except TimeoutError:
+        logger.error("append_expense timed out after {}s", settings.mcp.append_timeout)
+        if a1_range is None:
+            error = "Tiempo de espera agotado leyendo la hoja"
         else:
-            error = result.get("error", "Error desconocido del servidor MCP")
-            logger.error(f"MCP write_range failed: {error}")
-            return json.dumps({
-                "success": False,
-                "error": error,
-            })
+            error = f"Tiempo de espera agotado escribiendo {a1_range}; la fila puede haberse guardado"
+        return json.dumps({
+            "success": False,
+            "error": error,
+        })
 
     except Exception as e:
-        logger.exception(f"Error calling MCP write_range: {e}")
+        logger.exception("Error in append_expense: {}", e)
         return json.dumps({
             "success": False,
             "error": str(e),
         })
 
 
-@function_tool
-async def get_ranges(
-    ranges: list[str],
-) -> str:
-    """Read data from Google Sheets via MCP server.
-
-    Use this tool to read existing data, particularly to find the last row
-    with data before writing a new expense.
+def track_appends() -> list[asyncio.Task[str]]:
+    """Collect the append_expense calls made by the current request.
 
-    Args:
-        ranges: List of ranges to read in A1 notation (e.g., ["Gastos!A1:E100"])
+    Must be called from the request's task, before Runner.run(). Tool tasks
+    copy the request's context, so they append to the returned list.
 
     Returns:
-        JSON with the data from the requested ranges
+        List that receives one task per append_expense call
     """
-    logger.info(f"get_ranges called: {ranges}")
+    appends: list[asyncio.Task[str]] = []
+    _tracked_appends.set(appends)
+    return appends
 
-    if not mcp_client.is_connected:
-        logger.warning("MCP server not connected, attempting to establish connection")
 
-    try:
-        result = await mcp_client.call_tool(
-            "get_ranges",
-            {
-                "range": ranges,  # FIX: El servidor MCP .NET espera "range" no "ranges"
-            }
-        )
+async def appended_ranges(
+    appends: list[asyncio.Task[str]], timeout: float
+) -> tuple[list[str], int]:
+    """Wait briefly for tracked appends and return the ranges they wrote.
 
-        if result.get("success"):
-            logger.info(f"Successfully read {len(ranges)} range(s)")
-            return json.dumps({
-                "success": True,
-                "data": result.get("data") or result.get("values") or result,
-            })
-        else:
-            error = result.get("error", "Error desconocido del servidor MCP")
-            logger.error(f"MCP get_ranges failed: {error}")
-            return json.dumps({
-                "success": False,
-                "error": error,
-            })
+    Args:
+        appends: List returned by track_appends()
+        timeout: Seconds to wait for appends still in flight
 
-    except Exception as e:
-        logger.exception(f"Error calling MCP get_ranges: {e}")
-        return json.dumps({
-            "success": False,
-            "error": str(e),
-        })
+    Returns:
+        A1 ranges of the rows that were actually written, and the number of
+        appends still unfinished (their rows may or may not land)
+    """
+    if not appends:
+        return [], 0
 
+    done, pending = await asyncio.wait(appends, timeout=timeout)
+    ranges = []
+    for task in done:
+        if not task.cancelled() and task.exception() is None:
+            result = json.loads(task.result())
+            if result.get("success"):
+                ranges.append(result["range"])
+    return sorted(ranges), len(pending)
 
+
+# --- MCP Tools for Google Sheets ---
 @function_tool
-async def get_next_row(range_to_read: str) -> str:
-    """Calculate the next available row number in a Google Sheets range.
+async def append_expense(values: list[str]) -> str:
+    """Append one expense row to the Gastos sheet, after the last filled row.
 
-    Reads the specified range and automatically calculates which row number
-    should be used for the next write operation. Use this instead of manually
-    counting rows to avoid overwriting existing data.
+    Reads the sheet, computes the next empty row and writes the row there in
+    a single call, so no row number has to be passed around.
 
     Args:
-        range_to_read: Range to read in A1 notation (e.g., "Gastos!A1:E200").
-                      Use a large range to ensure all data is read.
+        values: Row in column order: [fecha, tipo, categoria, importe, descripcion]
+            (e.g., ["05/11/2025", "Gasto", "Otros", "362,67", "IRPF 2024"])
 
     Returns:
-        JSON with the next available row number and the range to write to
+        JSON with success status and the range written
     """
-    logger.info(f"get_next_row called with range: {range_to_read}")
-
-    if not mcp_client.is_connected:
-        logger.warning("MCP server not connected, attempting to establish connection")
+    logger.info("append_expense called")
+    logger.debug("Values: {}", values)
 
-    try:
-        # Read existing data
-        result = await mcp_client.call_tool(
-            "get_ranges",
-            {
-                "range": [range_to_read],
-            }
-        )
+    # Shielded so a request deadline cannot cancel a write half-way: the
+    # row still lands and the caller learns about it via appended_ranges()
+    task = asyncio.ensure_future(_append_row(values))
+    appends = _tracked_appends.get()
+    if appends is not None:
+        appends.append(task)
+    return await asyncio.shield(task)
 
-        if not result.get("success"):
-            error = result.get("error", "Error reading sheet data")
-            logger.error(f"Failed to read ranges: {error}")
-            return json.dumps({
-                "success": False,
-                "error": error,
-            })
-
-        # Calculate next row from the data
-        data = result.get("data") or result
-        next_row = None
-
-        try:
-            if isinstance(data, dict):
-                value_ranges = data.get("ValueRanges", [])
-                if value_ranges and len(value_ranges) > 0:
-                    values = value_ranges[0].get("Values", [])
-                    if values:
-                        next_row = len(values) + 1
-                        logger.info(f"Calculated next_row: {next_row} (from {len(values)} existing rows)")
-        except Exception as e:
-            logger.error(f"Error calculating next_row: {e}")
-            return json.dumps({
-                "success": False,
-                "error": f"Could not calculate next row: {str(e)}",
-            })
-
-        if next_row is None:
-            return json.dumps({
-                "success": False,
-                "error": "Could not determine next row number",
-            })
-
-        # Extract sheet name and column range from input
-        # Format: "SheetName!A1:E200" -> extract "SheetName" and "A:E"
-        try:
-            sheet_part, cell_part = range_to_read.split("!")
-            start_cell, end_cell = cell_part.split(":")
-            # Extract columns (A from A1, E from E200)
-            start_col = ''.join(c for c in start_cell if c.isalpha())
-            end_col = ''.join(c for c in end_cell if c.isalpha())
-            range_to_write = f"{sheet_part}!{start_col}{next_row}:{end_col}{next_row}"
-        except Exception as e:
-            logger.warning(f"Could not parse range format: {e}. Using default.")
-            range_to_write = f"Gastos!A{next_row}:E{next_row}"
-
-        return json.dumps({
-            "success": True,
-            "next_row": next_row,
-            "range_to_write": range_to_write,
-            "message": f"Next available row is {next_row}",
-        })
-
-    except Exception as e:
-        logger.exception(f"Error in get_next_row: {e}")
-        return json.dumps({
-            "success": False,
-            "error": str(e),
-        })
@@ -12,10 +12,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from src.core.configs import settings
+from src.core.llm_manager import llm_manager
 from src.core.logging import setup_logging
 from src.expense_agents.constants import AGENT_TOOLS, FUNCTION_TOOLS
-from src.expense_agents.orchestrator import process_receipt_with_agents
-from src.models.schemas import ProcessReceiptRequest, ProcessReceiptResponse
+from src.expense_agents.orchestrator import (
+    create_expense_orchestrator,
+    process_receipt_with_agents,
+    process_receipts_batch,
+)
+from src.models.schemas import (
+    ProcessReceiptRequest,
+    ProcessReceiptResponse,
+    ProcessReceiptsBatchRequest,
+)
 from src.services.mcp_client import mcp_client
 
 
@@ -24,16 +33,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager.
 
     Handles startup and shutdown events:
-    - Startup: Initialize logging, connect to MCP server
-    - Shutdown: Cleanup connections
+    - Startup: Initialize logging, connect to MCP server, preload LLM clients
+    - Shutdown: Cleanup MCP and LLM client connections
 
     Note: API keys are exported to os.environ automatically when
     settings module is loaded (see src.core.configs).
     """
     # --- Startup ---
-    setup_logging(settings.log_level)
+    setup_logging(settings.log_level, backtrace=settings.debug)
     logger.info("Starting ExpenseSyncBot API")
-    logger.info(f"Debug mode: {settings.debug}")
+    logger.info("Debug mode: {}", settings.debug)
 
     # Initialize MCP client connection
     mcp_connected = await mcp_client.startup()
@@ -41,15 +50,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("MCP server connection established")
     else:
         logger.warning(
-            "MCP server not available. External tools (get_ranges, write_range) will fail. "
+            "MCP server not available. Saving expenses (append_expense) will fail. "
             "Ensure the C# MCP server is running."
         )
 
+    # Preload the models used by the agents so the first request doesn't
+    # pay for client construction
+    llm_manager.warmup(
+        (
+            settings.orchestrator.llm_provider,
+            settings.orchestrator.categorizer_provider,
+            settings.orchestrator.validator_provider,
+        )
+    )
+
     yield
 
     # --- Shutdown ---
     logger.info("Shutting down ExpenseSyncBot API")
     await mcp_client.shutdown()
+    await llm_manager.aclose()
+    # The cached agents hold models bound to the clients closed above;
+    # drop them so a later lifespan builds them on fresh clients
+    create_expense_orchestrator.cache_clear()
 
 
 # Create FastAPI app
@@ -91,7 +114,7 @@ async def detailed_health_check() -> dict:
         try:
             mcp_tools = await mcp_client.get_available_tools()
         except Exception as e:
-            logger.warning(f"Could not fetch MCP tools: {e}")
+            logger.warning("Could not fetch MCP tools: {}", e)
 
     return {
         "status": "healthy",
@@ -134,8 +157,8 @@ async def process_receipt(request: ProcessReceiptRequest) -> ProcessReceiptRespo
         ProcessReceiptResponse with processing result
     """
     logger.info("Received process-receipt request")
-    logger.debug(f"Email subject: {request.email_subject}")
-    logger.debug(f"Email body length: {len(request.email_body)} chars")
+    logger.debug("Email subject: {}", request.email_subject)
+    logger.debug("Email body length: {} chars", len(request.email_body))
 
     try:
         result = await process_receipt_with_agents(
@@ -144,17 +167,53 @@ async def process_receipt(request: ProcessReceiptRequest) -> ProcessReceiptRespo
             sender=request.sender,
         )
 
-        logger.info(f"Processing completed with status: {result.status}")
+        logger.info("Processing completed with status: {}", result.status)
         return result
 
     except Exception as e:
-        logger.exception(f"Error processing receipt: {e}")
+        logger.exception("Error processing receipt: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing receipt",
         )
 
 
+@app.post(
+    "/process-receipts",
+    response_model=list[ProcessReceiptResponse],
+    tags=["Processing"],
+    summary="Process a batch of receipt emails",
+    description="Processes several receipt emails in one request and returns one result per receipt",
+)
+async def process_receipts(
+    request: ProcessReceiptsBatchRequest,
+) -> list[ProcessReceiptResponse]:
+    """Process a batch of receipt emails.
+
+    Useful for queue-fed workloads (e.g. an inbox sweep in n8n) where
+    sending one HTTP request per email adds needless overhead.
+
+    Args:
+        request: ProcessReceiptsBatchRequest with the receipt emails
+
+    Returns:
+        List of ProcessReceiptResponse, in the same order as the request
+    """
+    logger.info(
+        "Received process-receipts request with {} receipts", len(request.receipts)
+    )
+
+    try:
+        return await process_receipts_batch(request.receipts)
+
+    except Exception as e:
+        logger.exception("Error processing receipt batch: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error processing receipt batch",
+        )
+
+
 # --- Utility Endpoints ---
 @app.get("/tools", tags=["Tools"])
 async def list_available_tools() -> dict:
@@ -165,7 +224,7 @@ async def list_available_tools() -> dict:
         mcp_tool_schemas = await mcp_client.get_available_tools()
         mcp_tools = [t["function"]["name"] for t in mcp_tool_schemas]
     except Exception as e:
-        logger.warning(f"Could not fetch MCP tools: {e}")
+        logger.warning("Could not fetch MCP tools: {}", e)
 
     return {
         "agent_tools": AGENT_TOOLS,
@@ -6,6 +6,7 @@ from src.models.schemas import (
     ProcessingStatus,
     ProcessReceiptRequest,
     ProcessReceiptResponse,
+    ProcessReceiptsBatchRequest,
     ValidationResult,
 )
 
@@ -14,6 +15,7 @@ __all__ = [
     "ExpenseCategory",
     "ProcessReceiptRequest",
     "ProcessReceiptResponse",
+    "ProcessReceiptsBatchRequest",
     "ProcessingStatus",
     "ValidationResult",
 ]
@@ -10,6 +10,11 @@ from enum import Enum
 
 from pydantic import BaseModel, Field
 
+# Receipts accepted by one POST /process-receipts call. At the default
+# concurrency (4) and deadline (120s) a full batch stays within a few
+# minutes, below common client and proxy timeouts.
+MAX_BATCH_RECEIPTS = 10
+
 
 class ExpenseCategory(str, Enum):
     """Supported expense categories."""
@@ -39,6 +44,7 @@ class ProcessingStatus(str, Enum):
     VALIDATION_FAILED = "validation_failed"
     CATEGORIZATION_FAILED = "categorization_failed"
     MCP_ERROR = "mcp_error"
+    SKIPPED = "skipped"
     ERROR = "error"
 
 
@@ -159,6 +165,17 @@ class ProcessReceiptRequest(BaseModel):
     )
 
 
+class ProcessReceiptsBatchRequest(BaseModel):
+    """Request body for processing several receipt emails at once."""
+
+    receipts: list[ProcessReceiptRequest] = Field(
+        ...,
+        description="Receipt emails to process, in order",
+        min_length=1,
+        max_length=MAX_BATCH_RECEIPTS,
+    )
+
+
 class ProcessReceiptResponse(BaseModel):
     """Response from receipt processing endpoint."""
 
@@ -5,6 +5,7 @@ a long-lived SSE connection to the MCP server with automatic reconnection.
 """
 
 import asyncio
+import json
 from contextlib import AsyncExitStack
 from typing import Any
 
@@ -26,8 +27,10 @@ class MCPClientManager:
     def __init__(self) -> None:
         self._session: ClientSession | None = None
         self._tools: dict[str, Tool] = {}
+        self._tool_schemas: list[dict[str, Any]] = []
         self._connected: bool = False
         self._connection_lock = asyncio.Lock()
+        self._reconnect_lock = asyncio.Lock()
         self._exit_stack: AsyncExitStack | None = None
 
     @property
@@ -60,7 +63,7 @@ class MCPClientManager:
 
             try:
                 server_url = settings.mcp.server_url
-                logger.info(f"Establishing persistent connection to MCP server at {server_url}")
+                logger.info("Establishing persistent connection to MCP server at {}", server_url)
 
                 # Use AsyncExitStack for proper context manager lifecycle
                 self._exit_stack = AsyncExitStack()
@@ -86,9 +89,12 @@ class MCPClientManager:
                 # Discover available tools
                 tools_result = await self._session.list_tools()
                 self._tools = {tool.name: tool for tool in tools_result.tools}
+                self._tool_schemas = [
+                    self._to_openai_schema(tool) for tool in self._tools.values()
+                ]
 
                 logger.info(
-                    f"Discovered {len(self._tools)} MCP tools: {list(self._tools.keys())}"
+                    "Discovered {} MCP tools: {}", len(self._tools), list(self._tools)
                 )
 
                 self._connected = True
@@ -101,7 +107,7 @@ class MCPClientManager:
                 return False
 
             except Exception as e:
-                logger.warning(f"Failed to connect to MCP server: {e}")
+                logger.warning("Failed to connect to MCP server: {}", e)
                 await self._disconnect_internal()
                 return False
 
@@ -113,38 +119,48 @@ class MCPClientManager:
                 await self._exit_stack.aclose()
 
         except Exception as e:
-            logger.debug(f"Error during disconnect: {e}")
+            logger.debug("Error during disconnect: {}", e)
 
         finally:
             self._session = None
             self._exit_stack = None
             self._tools = {}
+            self._tool_schemas = []
             self._connected = False
 
-    async def _ensure_connected(self) -> bool:
+    async def ensure_connected(self) -> bool:
         """Ensure the connection is alive, reconnecting if necessary.
 
+        Concurrent callers share a single reconnection: the first one
+        reconnects while the rest wait and then reuse the new session,
+        instead of each tearing down the connection the previous one just
+        established.
+
         Returns:
             True if connected (or successfully reconnected), False otherwise
         """
         if self.is_connected:
             return True
 
-        logger.warning("MCP connection lost, attempting to reconnect...")
+        async with self._reconnect_lock:
+            if self.is_connected:
+                return True
 
-        # Try to reconnect with retries
-        for attempt in range(settings.mcp.retry_attempts):
-            logger.info(f"Reconnection attempt {attempt + 1}/{settings.mcp.retry_attempts}")
+            logger.warning("MCP connection lost, attempting to reconnect...")
 
-            if await self._connect():
-                logger.success("Successfully reconnected to MCP server")
-                return True
+            # Try to reconnect with retries
+            for attempt in range(settings.mcp.retry_attempts):
+                logger.info("Reconnection attempt {}/{}", attempt + 1, settings.mcp.retry_attempts)
 
-            if attempt < settings.mcp.retry_attempts - 1:
-                await asyncio.sleep(settings.mcp.retry_delay * (attempt + 1))  # Exponential backoff
+                if await self._connect():
+                    logger.success("Successfully reconnected to MCP server")
+                    return True
 
-        logger.error("Failed to reconnect to MCP server after all attempts")
-        return False
+                if attempt < settings.mcp.retry_attempts - 1:
+                    await asyncio.sleep(settings.mcp.retry_delay * (attempt + 1))  # Exponential backoff
+
+            logger.error("Failed to reconnect to MCP server after all attempts")
+            return False
 
     async def call_tool(
         self,
@@ -163,7 +179,7 @@ class MCPClientManager:
             Tool result dictionary with 'success' field
         """
         # Ensure we're connected (reconnect if needed)
-        if not await self._ensure_connected():
+        if not await self.ensure_connected():
             return {
                 "success": False,
                 "error": "Could not establish connection to MCP server",
@@ -183,8 +199,8 @@ class MCPClientManager:
                 "error": f"Tool '{tool_name}' not found. Available tools: {available}",
             }
 
-        logger.info(f"Calling MCP tool: {tool_name}")
-        logger.debug(f"Tool arguments: {arguments}")
+        logger.info("Calling MCP tool: {}", tool_name)
+        logger.debug("Tool arguments: {}", arguments)
 
         try:
             # Call the tool using the persistent session
@@ -195,51 +211,51 @@ class MCPClientManager:
                 for content in result.content:
                     if hasattr(content, "text"):
                         try:
-                            import json
-
                             response_data = json.loads(content.text)
-                            logger.info(f"MCP tool '{tool_name}' completed successfully")
+                            logger.info("MCP tool '{}' completed successfully", tool_name)
                             return {"success": True, **response_data}
 
                         except json.JSONDecodeError:
-                            logger.info(f"MCP tool '{tool_name}' completed (non-JSON response)")
+                            logger.info("MCP tool '{}' completed (non-JSON response)", tool_name)
                             return {"success": True, "result": content.text}
 
-            logger.info(f"MCP tool '{tool_name}' completed with no content")
+            logger.info("MCP tool '{}' completed with no content", tool_name)
             return {"success": True}
 
         except Exception as e:
-            logger.error(f"MCP tool call failed: {e}")
+            logger.error("MCP tool call failed: {}", e)
 
             # Mark as disconnected so next call will attempt reconnection
             self._connected = False
 
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _to_openai_schema(tool: Tool) -> dict[str, Any]:
+        """Convert an MCP tool definition to an OpenAI function schema."""
+        return {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description or f"MCP tool: {tool.name}",
+                "parameters": tool.inputSchema or {"type": "object", "properties": {}},
+            },
+        }
+
     async def get_available_tools(self) -> list[dict[str, Any]]:
         """Get available tools from MCP server.
 
-        Uses cached tools from the persistent connection.
+        Schemas are built once when the connection is established and
+        reused until the next (re)connection.
 
         Returns:
             List of tool schemas in OpenAI format
         """
-        if not await self._ensure_connected():
+        if not await self.ensure_connected():
             logger.warning("Cannot fetch tools: not connected to MCP server")
             return []
 
-        schemas = []
-        for tool in self._tools.values():
-            schemas.append({
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description or f"MCP tool: {tool.name}",
-                    "parameters": tool.inputSchema or {"type": "object", "properties": {}},
-                },
-            })
-
-        return schemas
+        return list(self._tool_schemas)
 
     async def shutdown(self) -> None:
         """Cleanup on application shutdown."""
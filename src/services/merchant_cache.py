@@ -0,0 +1,111 @@
+"""In-memory cache of validator verdicts per merchant.
+
+Recurring merchants (Mercadona, Netflix, Apple.com/bill, ...) are almost
+always categorized the same way. Once the validator agent has approved the
+same category and type for a merchant enough times, later validations for
+that merchant can be answered locally instead of with another LLM call.
+"""
+
+import re
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.core.configs import settings
+
+_NON_LETTERS_RE = re.compile(r"[^A-Z]")
+
+# Payment channels, not merchants: the same prefix covers both expenses and
+# income with unrelated categories, so they always go through the validator.
+_GENERIC_PREFIXES = ("BIZUM", "TRANSFERENCIA", "PAYPAL", "AMAZON")
+
+
+@dataclass(slots=True)
+class _MerchantVerdict:
+    """Category/type approved by the validator for a merchant."""
+
+    categoria: str
+    tipo: str
+    observations: int = 1
+
+
+class MerchantCache:
+    """Remembers which (categoria, tipo) the validator approved per merchant.
+
+    Entries are only created from validator approvals, and any rejection
+    for a merchant drops its entry, so a hit always reflects a repeated,
+    uncontested verdict. Generic payment channels (Bizum, transfers, ...)
+    are never cached.
+    """
+
+    def __init__(self, min_observations: int) -> None:
+        self._min_observations = min_observations
+        self._verdicts: dict[str, _MerchantVerdict] = {}
+
+    @staticmethod
+    def fingerprint(descripcion: str) -> str:
+        """Normalize an expense description to a merchant key.
+
+        Args:
+            descripcion: Expense description produced by the categorizer
+
+        Returns:
+            Uppercase letters of the whole description, truncated to 20 chars
+        """
+        return _NON_LETTERS_RE.sub("", descripcion.upper())[:20]
+
+    def _cache_key(self, descripcion: str) -> str | None:
+        """Key for a description, or None if it must never be cached."""
+        key = self.fingerprint(descripcion)
+        if not key or key.startswith(_GENERIC_PREFIXES):
+            return None
+        return key
+
+    def is_trusted(self, descripcion: str, categoria: str, tipo: str) -> bool:
+        """Check whether this categorization matches a repeatedly approved verdict.
+
+        Args:
+            descripcion: Expense description
+            categoria: Category assigned by the categorizer
+            tipo: Movement type assigned by the categorizer
+
+        Returns:
+            True if the validator can be skipped for this expense
+        """
+        if self._min_observations <= 0:
+            return False
+
+        key = self._cache_key(descripcion)
+        if key is None:
+            return False
+
+        verdict = self._verdicts.get(key)
+        return (
+            verdict is not None
+            and verdict.observations >= self._min_observations
+            and verdict.categoria == categoria
+            and verdict.tipo == tipo
+        )
+
+    def record_approval(self, descripcion: str, categoria: str, tipo: str) -> None:
+        """Record that the validator approved this categorization."""
+        key = self._cache_key(descripcion)
+        if key is None:
+            return
+
+        verdict = self._verdicts.get(key)
+        if verdict and verdict.categoria == categoria and verdict.tipo == tipo:
+            verdict.observations += 1
+        else:
+            self._verdicts[key] = _MerchantVerdict(categoria=categoria, tipo=tipo)
+
+    def record_rejection(self, descripcion: str) -> None:
+        """Forget the merchant after the validator rejected a categorization."""
+        if self._verdicts.pop(self.fingerprint(descripcion), None):
+            logger.debug("Dropped cached verdict for merchant: {}", descripcion)
+
+
+# Global singleton instance
+merchant_cache = MerchantCache(
+    min_observations=settings.orchestrator.merchant_cache_min_observations,
+)
@@ -0,0 +1,42 @@
+"""Local pre-check that filters out emails that are obviously not receipts.
+
+Gmail filters also forward marketing emails, newsletters and delivery
+notifications. Running the full agent graph on those costs several LLM
+calls before the orchestrator gives up, so a cheap regex check rejects
+them up front.
+
+The check is deliberately conservative: an email is only skipped when it
+has neither an amount nor any payment-related keyword (Spanish or
+English). Any decimal number counts as an amount, with or without a
+currency symbol, and HTML euro entities are recognised.
+"""
+
+import re
+
+# 15,67 / 12.99 / 1.234,50 EUR / $9 / 12 USD / 23 &euro; / 5 &#8364;
+_CURRENCY = r"(?:€|&euro;|&#8364;|&#x20ac;|EUR|USD|\$)"
+_AMOUNT_RE = re.compile(
+    rf"\d+[.,]\d{{2}}|\d+\s*{_CURRENCY}|{_CURRENCY}\s*\d",
+    re.IGNORECASE,
+)
+
+_KEYWORD_RE = re.compile(
+    r"\b(?:cargo|compra|bizum|transferencia|pago|importe|recibo|factura"
+    r"|adeudo|abono|ingreso|tarjeta|domiciliaci[oó]n"
+    r"|receipt|payment|total|invoice|order|charged)\b",
+    re.IGNORECASE,
+)
+
+
+def looks_like_receipt(email_body: str, email_subject: str | None = None) -> bool:
+    """Check whether an email could plausibly be a bank movement or receipt.
+
+    Args:
+        email_body: Raw email body content (plain text or HTML)
+        email_subject: Optional email subject
+
+    Returns:
+        False only if the email has no amount and no payment keyword
+    """
+    text = f"{email_subject}\n{email_body}" if email_subject else email_body
+    return bool(_AMOUNT_RE.search(text) or _KEYWORD_RE.search(text))
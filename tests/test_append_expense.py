@@ -0,0 +1,159 @@
+"""Tests for the append_expense tool against a fake MCP sheet."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from agents import RunContextWrapper
+
+from src.expense_agents import orchestrator, tools
+from src.models.schemas import ProcessingStatus
+
+
+class FakeSheet:
+    """In-memory stand-in for the MCP get_ranges/write_range tools."""
+
+    def __init__(self, rows: int) -> None:
+        self.rows: dict[int, list[str]] = {i: ["x"] for i in range(1, rows + 1)}
+        self.calls: list[str] = []
+
+    async def call_tool(self, name: str, args: dict[str, Any]) -> dict[str, Any]:
+        self.calls.append(name)
+        await asyncio.sleep(0.01)
+        if name == "get_ranges":
+            values = [self.rows[i] for i in sorted(self.rows)]
+            return {"success": True, "data": {"ValueRanges": [{"Values": values}]}}
+        row = int(args["range"].split(":")[0].removeprefix("Gastos!A"))
+        self.rows[row] = args["values"][0]
+        return {"success": True}
+
+
+@pytest.fixture
+def sheet(monkeypatch: pytest.MonkeyPatch) -> FakeSheet:
+    fake = FakeSheet(rows=3)
+    monkeypatch.setattr(tools.mcp_client, "call_tool", fake.call_tool)
+    return fake
+
+
+async def append(values: list[str]) -> dict[str, Any]:
+    output = await tools.append_expense.on_invoke_tool(
+        RunContextWrapper(context=None), json.dumps({"values": values})
+    )
+    return json.loads(output)
+
+
+async def test_concurrent_appends_get_distinct_rows(sheet: FakeSheet) -> None:
+    results = await asyncio.gather(*(append([str(i)]) for i in range(4)))
+
+    assert sorted(r["range"] for r in results) == [
+        f"Gastos!A{row}:E{row}" for row in (4, 5, 6, 7)
+    ]
+    assert sheet.calls.count("get_ranges") == 4
+    assert sheet.calls.count("write_range") == 4
+
+
+async def test_prefetched_read_is_reused(sheet: FakeSheet) -> None:
+    tools.prefetch_next_row()
+
+    result = await append(["a"])
+
+    assert result["range"] == "Gastos!A4:E4"
+    assert sheet.calls == ["get_ranges", "write_range"]
+
+
+async def test_prefetch_is_stale_after_a_failed_write_that_landed(
+    sheet: FakeSheet, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    call_tool = sheet.call_tool
+
+    async def write_lands_but_fails(name: str, args: dict[str, Any]) -> dict[str, Any]:
+        result = await call_tool(name, args)
+        return (
+            {"success": False, "error": "timeout"} if name == "write_range" else result
+        )
+
+    tools.prefetch_next_row()
+    await asyncio.sleep(0.02)
+    monkeypatch.setattr(tools.mcp_client, "call_tool", write_lands_but_fails)
+    assert not (await append(["a"]))["success"]
+    monkeypatch.setattr(tools.mcp_client, "call_tool", call_tool)
+
+    assert (await append(["b"]))["range"] == "Gastos!A5:E5"
+
+
+async def test_deadline_does_not_cancel_a_write_in_flight(sheet: FakeSheet) -> None:
+    appends = tools.track_appends()
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.015):
+            await append(["a"])
+
+    assert await tools.appended_ranges(appends, timeout=1) == (["Gastos!A4:E4"], 0)
+    assert sheet.rows[4] == ["a"]
+
+
+async def test_unused_prefetch_is_cancelled_on_error(
+    sheet: FakeSheet, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    started: list[asyncio.Task] = []
+    prefetch_next_row = tools.prefetch_next_row
+
+    def record_prefetch() -> asyncio.Task:
+        started.append(prefetch_next_row())
+        return started[-1]
+
+    async def failing_run(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(orchestrator, "prefetch_next_row", record_prefetch)
+    monkeypatch.setattr(orchestrator, "create_expense_orchestrator", lambda: None)
+    monkeypatch.setattr(orchestrator.Runner, "run", failing_run)
+
+    response = await orchestrator.process_receipt_with_agents("Cargo MERCADONA 15,67€")
+
+    assert response.status == ProcessingStatus.ERROR
+    assert started[0].cancelled() or started[0].cancelling()
+
+
+async def test_hung_write_is_reported_unfinished_and_releases_the_lock(
+    sheet: FakeSheet, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    call_tool = sheet.call_tool
+
+    async def hang_first_write(name: str, args: dict[str, Any]) -> dict[str, Any]:
+        if name == "write_range" and sheet.calls.count("write_range") == 0:
+            sheet.calls.append(name)
+            await asyncio.Event().wait()
+        return await call_tool(name, args)
+
+    monkeypatch.setattr(tools.mcp_client, "call_tool", hang_first_write)
+    monkeypatch.setattr(tools.settings.mcp, "append_timeout", 0.1)
+    appends = tools.track_appends()
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await append(["a"])
+
+    assert await tools.appended_ranges(appends, timeout=0.01) == ([], 1)
+    hung = json.loads(await appends[0])
+    assert not hung["success"]
+    assert "Gastos!A4:E4" in hung["error"]
+    assert (await append(["b"]))["range"] == "Gastos!A4:E4"
+
+
+async def test_timeout_from_a_tool_is_not_reported_as_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def tool_timeout(*args: Any, **kwargs: Any) -> None:
+        raise TimeoutError
+
+    monkeypatch.setattr(orchestrator, "create_expense_orchestrator", lambda: None)
+    monkeypatch.setattr(orchestrator.Runner, "run", tool_timeout)
+
+    response = await orchestrator.process_receipt_with_agents(
+        "Cargo MERCADONA 15,67€", prefetch=False
+    )
+
+    assert response.status == ProcessingStatus.ERROR
+    assert response.errors == ["internal_server_error"]
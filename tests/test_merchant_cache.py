@@ -0,0 +1,73 @@
+"""Tests for the merchant verdict cache."""
+
+from src.services.merchant_cache import MerchantCache
+
+
+def approve(
+    cache: MerchantCache,
+    descripcion: str,
+    times: int,
+    categoria: str = "Alimentación",
+    tipo: str = "Gasto",
+) -> None:
+    for _ in range(times):
+        cache.record_approval(descripcion, categoria, tipo)
+
+
+def test_fingerprint_uses_whole_description() -> None:
+    assert (
+        MerchantCache.fingerprint("Mercadona - supermercado") == "MERCADONASUPERMERCAD"
+    )
+    assert MerchantCache.fingerprint("Bizum - Paula") != MerchantCache.fingerprint(
+        "Bizum - cena"
+    )
+
+
+def test_trusted_after_min_observations() -> None:
+    cache = MerchantCache(min_observations=3)
+    approve(cache, "Mercadona - supermercado", 2)
+    assert not cache.is_trusted("Mercadona - supermercado", "Alimentación", "Gasto")
+
+    approve(cache, "Mercadona - supermercado", 1)
+    assert cache.is_trusted("Mercadona - supermercado", "Alimentación", "Gasto")
+
+
+def test_not_trusted_for_different_verdict() -> None:
+    cache = MerchantCache(min_observations=1)
+    approve(cache, "Mercadona - supermercado", 1)
+    assert not cache.is_trusted("Mercadona - supermercado", "Ocio", "Gasto")
+    assert not cache.is_trusted("Mercadona - supermercado", "Alimentación", "Ingreso")
+
+
+def test_changed_verdict_restarts_count() -> None:
+    cache = MerchantCache(min_observations=2)
+    approve(cache, "Mercadona - supermercado", 1)
+    approve(cache, "Mercadona - supermercado", 1, categoria="Hogar")
+    assert not cache.is_trusted("Mercadona - supermercado", "Hogar", "Gasto")
+
+
+def test_rejection_drops_entry() -> None:
+    cache = MerchantCache(min_observations=1)
+    approve(cache, "Netflix - suscripción", 1, categoria="Suscripciones")
+    cache.record_rejection("Netflix - suscripción")
+    assert not cache.is_trusted("Netflix - suscripción", "Suscripciones", "Gasto")
+
+
+def test_generic_payment_channels_are_never_trusted() -> None:
+    cache = MerchantCache(min_observations=1)
+    for descripcion in (
+        "Bizum - Paula",
+        "Transferencia - alquiler",
+        "PayPal - compra",
+        "Amazon - libro",
+    ):
+        approve(cache, descripcion, 3, categoria="Otros", tipo="Ingreso")
+        assert not cache.is_trusted(descripcion, "Otros", "Ingreso")
+
+    assert not cache.is_trusted("Bizum - pago cena amigos", "Otros", "Ingreso")
+
+
+def test_disabled_when_min_observations_is_zero() -> None:
+    cache = MerchantCache(min_observations=0)
+    approve(cache, "Mercadona - supermercado", 5)
+    assert not cache.is_trusted("Mercadona - supermercado", "Alimentación", "Gasto")
@@ -0,0 +1,41 @@
+"""Tests for the receipt pre-check."""
+
+import pytest
+
+from src.services.receipt_precheck import looks_like_receipt
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "Cargo en cuenta: MERCADONA 15,67€",
+        "APPLE.COM/BILL 2,99€",
+        "Bizum recibido de Paula",
+        "Receipt from Netflix. Amount: 12.99",
+        "Your Uber trip total: 12.40",
+        "Order total: 23.99 &euro;",
+        "<p>Importe: 5 &#8364;</p>",
+        "Paid 9 EUR at the parking",
+        "Transferencia realizada 1.234,50",
+    ],
+)
+def test_receipts_are_kept(body: str) -> None:
+    assert looks_like_receipt(body)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "Tu pedido ha sido enviado, llega mañana",
+        "Newsletter de octubre: novedades",
+        "<html><body><h1>Bienvenido</h1></body></html>",
+    ],
+)
+def test_obvious_non_receipts_are_skipped(body: str) -> None:
+    assert not looks_like_receipt(body)
+
+
+def test_subject_is_considered() -> None:
+    assert looks_like_receipt(
+        "Gracias por confiar en nosotros", email_subject="Tu factura"
+    )
@@ -0,0 +1,21 @@
+"""Tests for the request schemas."""
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.schemas import MAX_BATCH_RECEIPTS, ProcessReceiptsBatchRequest
+
+
+def batch(size: int) -> dict:
+    return {"receipts": [{"email_body": "Cargo MERCADONA 15,67€"}] * size}
+
+
+def test_batch_up_to_the_limit_is_accepted() -> None:
+    request = ProcessReceiptsBatchRequest.model_validate(batch(MAX_BATCH_RECEIPTS))
+    assert len(request.receipts) == MAX_BATCH_RECEIPTS
+
+
+@pytest.mark.parametrize("size", [0, MAX_BATCH_RECEIPTS + 1])
+def test_batch_size_is_bounded(size: int) -> None:
+    with pytest.raises(ValidationError):
+        ProcessReceiptsBatchRequest.model_validate(batch(size))